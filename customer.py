@@ -1,45 +1,54 @@
 """Module for Customer class with file persistence."""
 
-import json
-import os
+import atexit
+import logging
+
+from storage import JsonStore
+
+logger = logging.getLogger(__name__)
 
 CUSTOMERS_FILE = "data/customers.json"
 
+AUTOFLUSH = True
+
+_STORE = JsonStore("customers", lambda: CUSTOMERS_FILE)
+
+
+def invalidate_cache():
+    """Clear the in-memory cache and dirty state (used by tests)."""
+    _STORE.invalidate()
+
 
 def _load_customers():
-    """Load customers from JSON file."""
-    if not os.path.exists(CUSTOMERS_FILE):
-        return {}
-    try:
-        with open(CUSTOMERS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                print(
-                    "Error: customers file has invalid format. Starting fresh."
-                )
-                return {}
-            return data
-    except json.JSONDecodeError as e:
-        print(f"Error reading customers file: {e}. Starting fresh.")
-        return {}
-    except OSError as e:
-        print(f"Error opening customers file: {e}. Starting fresh.")
-        return {}
+    """Load customers from JSON file, reusing the cache when unchanged."""
+    return _STORE.load()
+
+
+def _find_customer(customer_id):
+    """Fetch one customer record from the loaded dictionary."""
+    return _STORE.load().get(customer_id)
 
 
 def _save_customers(customers):
-    """Save customers dictionary to JSON file."""
-    os.makedirs("data", exist_ok=True)
-    try:
-        with open(CUSTOMERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(customers, f, indent=4)
-    except OSError as e:
-        print(f"Error saving customers file: {e}")
+    """Save customers to JSON file, deferring while AUTOFLUSH is off."""
+    _STORE.save(customers, AUTOFLUSH)
+
+
+def flush():
+    """Write any deferred customer changes to disk."""
+    _STORE.flush()
+
+
+atexit.register(flush)
 
 
 class Customer:
     """Represents a customer in the reservation system."""
 
+    __slots__ = ("customer_id", "name", "email", "phone")
+
+    _pool = []
+
     def __init__(self, customer_id, name, email, phone):
         """Initialize a Customer instance."""
         self.customer_id = customer_id
@@ -47,6 +56,22 @@ class Customer:
         self.email = email
         self.phone = phone
 
+    @classmethod
+    def _acquire(cls, customer_id, name, email, phone):
+        """Reuse a pooled instance when available, else build a new one."""
+        if cls._pool:
+            customer = cls._pool.pop()
+            customer.customer_id = customer_id
+            customer.name = name
+            customer.email = email
+            customer.phone = phone
+            return customer
+        return cls(customer_id, name, email, phone)
+
+    def release(self):
+        """Return this instance to the reuse pool."""
+        type(self)._pool.append(self)
+
     def to_dict(self):
         """Convert customer to dictionary."""
         return {
@@ -59,46 +84,83 @@ class Customer:
     @classmethod
     def from_dict(cls, data):
         """Create a Customer from a dictionary."""
-        return cls(
+        return cls._acquire(
             data["customer_id"],
             data["name"],
             data["email"],
             data["phone"],
         )
 
+    @staticmethod
+    def flush():
+        """Write any deferred customer changes to disk."""
+        flush()
+
     @staticmethod
     def create_customer(customer_id, name, email, phone):
         """Create and persist a new customer."""
         customers = _load_customers()
         if customer_id in customers:
-            print(f"Error: Customer with ID '{customer_id}' already exists.")
+            logger.error(
+                "Customer with ID '%s' already exists.", customer_id
+            )
             return None
         customer = Customer(customer_id, name, email, phone)
         customers[customer_id] = customer.to_dict()
         _save_customers(customers)
-        print(f"Customer '{name}' created successfully.")
+        logger.info("Customer '%s' created successfully.", name)
         return customer
 
+    @staticmethod
+    def create_many(records):
+        """Create several customers with a single load and save.
+
+        Records whose ID already exists are skipped. Returns the list
+        of records actually added.
+        """
+        customers = _load_customers()
+        added = []
+        for record in records:
+            customer_id = record.get("customer_id")
+            name = record.get("name")
+            email = record.get("email")
+            phone = record.get("phone")
+            if None in (customer_id, name, email, phone):
+                logger.error(
+                    "Customer record is missing required fields."
+                )
+                continue
+            if customer_id in customers:
+                logger.error(
+                    "Customer with ID '%s' already exists.", customer_id
+                )
+                continue
+            customers[customer_id] = Customer(
+                customer_id, name, email, phone
+            ).to_dict()
+            added.append(record)
+        if added:
+            _save_customers(customers)
+        return added
+
     @staticmethod
     def delete_customer(customer_id):
         """Delete a customer by ID."""
         customers = _load_customers()
-        if customer_id not in customers:
-            print(f"Error: Customer with ID '{customer_id}' not found.")
+        if customers.pop(customer_id, None) is None:
+            logger.error("Customer with ID '%s' not found.", customer_id)
             return False
-        del customers[customer_id]
         _save_customers(customers)
-        print(f"Customer '{customer_id}' deleted successfully.")
+        logger.info("Customer '%s' deleted successfully.", customer_id)
         return True
 
     @staticmethod
     def display_customer(customer_id):
         """Display customer information."""
-        customers = _load_customers()
-        if customer_id not in customers:
-            print(f"Error: Customer with ID '{customer_id}' not found.")
+        data = _find_customer(customer_id)
+        if data is None:
+            logger.error("Customer with ID '%s' not found.", customer_id)
             return None
-        data = customers[customer_id]
         print("--- Customer Info ---")
         print(f"ID    : {data['customer_id']}")
         print(f"Name  : {data['name']}")
@@ -110,15 +172,16 @@ class Customer:
     def modify_customer(customer_id, name=None, email=None, phone=None):
         """Modify customer attributes."""
         customers = _load_customers()
-        if customer_id not in customers:
-            print(f"Error: Customer with ID '{customer_id}' not found.")
+        record = customers.get(customer_id)
+        if record is None:
+            logger.error("Customer with ID '%s' not found.", customer_id)
             return False
         if name:
-            customers[customer_id]["name"] = name
+            record["name"] = name
         if email:
-            customers[customer_id]["email"] = email
+            record["email"] = email
         if phone:
-            customers[customer_id]["phone"] = phone
+            record["phone"] = phone
         _save_customers(customers)
-        print(f"Customer '{customer_id}' modified successfully.")
+        logger.info("Customer '%s' modified successfully.", customer_id)
         return True
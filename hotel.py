@@ -1,43 +1,55 @@
 """Module for Hotel class with file persistence."""
 
-import json
-import os
+import atexit
+import logging
+
+from storage import JsonStore
+
+logger = logging.getLogger(__name__)
 
 HOTELS_FILE = "data/hotels.json"
 
+AUTOFLUSH = True
+
+_STORE = JsonStore("hotels", lambda: HOTELS_FILE)
+
+
+def invalidate_cache():
+    """Clear the in-memory cache and dirty state (used by tests)."""
+    _STORE.invalidate()
+
 
 def _load_hotels():
-    """Load hotels from JSON file."""
-    if not os.path.exists(HOTELS_FILE):
-        return {}
-    try:
-        with open(HOTELS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                print("Error: hotels file has invalid format. Starting fresh.")
-                return {}
-            return data
-    except json.JSONDecodeError as e:
-        print(f"Error reading hotels file: {e}. Starting fresh.")
-        return {}
-    except OSError as e:
-        print(f"Error opening hotels file: {e}. Starting fresh.")
-        return {}
+    """Load hotels from JSON file, reusing the cache when unchanged."""
+    return _STORE.load()
+
+
+def _find_hotel(hotel_id):
+    """Fetch one hotel record from the loaded dictionary."""
+    return _STORE.load().get(hotel_id)
 
 
 def _save_hotels(hotels):
-    """Save hotels dictionary to JSON file."""
-    os.makedirs("data", exist_ok=True)
-    try:
-        with open(HOTELS_FILE, "w", encoding="utf-8") as f:
-            json.dump(hotels, f, indent=4)
-    except OSError as e:
-        print(f"Error saving hotels file: {e}")
+    """Save hotels to JSON file, deferring while AUTOFLUSH is off."""
+    _STORE.save(hotels, AUTOFLUSH)
+
+
+def flush():
+    """Write any deferred hotel changes to disk."""
+    _STORE.flush()
+
+
+atexit.register(flush)
 
 
 class Hotel:
     """Represents a hotel with rooms and reservations."""
 
+    __slots__ = ("hotel_id", "name", "location", "total_rooms",
+                 "available_rooms")
+
+    _pool = []
+
     def __init__(self, hotel_id, name, location, total_rooms):
         """Initialize a Hotel instance."""
         self.hotel_id = hotel_id
@@ -46,6 +58,23 @@ class Hotel:
         self.total_rooms = total_rooms
         self.available_rooms = total_rooms
 
+    @classmethod
+    def _acquire(cls, hotel_id, name, location, total_rooms):
+        """Reuse a pooled instance when available, else build a new one."""
+        if cls._pool:
+            hotel = cls._pool.pop()
+            hotel.hotel_id = hotel_id
+            hotel.name = name
+            hotel.location = location
+            hotel.total_rooms = total_rooms
+            hotel.available_rooms = total_rooms
+            return hotel
+        return cls(hotel_id, name, location, total_rooms)
+
+    def release(self):
+        """Return this instance to the reuse pool."""
+        type(self)._pool.append(self)
+
     def to_dict(self):
         """Convert hotel to dictionary."""
         return {
@@ -59,7 +88,7 @@ class Hotel:
     @classmethod
     def from_dict(cls, data):
         """Create a Hotel from a dictionary."""
-        hotel = cls(
+        hotel = cls._acquire(
             data["hotel_id"],
             data["name"],
             data["location"],
@@ -70,39 +99,71 @@ class Hotel:
         )
         return hotel
 
+    @staticmethod
+    def flush():
+        """Write any deferred hotel changes to disk."""
+        flush()
+
     @staticmethod
     def create_hotel(hotel_id, name, location, total_rooms):
         """Create and persist a new hotel."""
         hotels = _load_hotels()
         if hotel_id in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' already exists.")
+            logger.error("Hotel with ID '%s' already exists.", hotel_id)
             return None
         hotel = Hotel(hotel_id, name, location, total_rooms)
         hotels[hotel_id] = hotel.to_dict()
         _save_hotels(hotels)
-        print(f"Hotel '{name}' created successfully.")
+        logger.info("Hotel '%s' created successfully.", name)
         return hotel
 
+    @staticmethod
+    def create_many(records):
+        """Create several hotels with a single load and save.
+
+        Records whose ID already exists are skipped. Returns the list
+        of records actually added.
+        """
+        hotels = _load_hotels()
+        added = []
+        for record in records:
+            hotel_id = record.get("hotel_id")
+            if None in (hotel_id, record.get("name"),
+                        record.get("location"),
+                        record.get("total_rooms")):
+                logger.error(
+                    "Hotel record is missing required fields."
+                )
+                continue
+            if hotel_id in hotels:
+                logger.error(
+                    "Hotel with ID '%s' already exists.", hotel_id
+                )
+                continue
+            hotels[hotel_id] = Hotel.from_dict(record).to_dict()
+            added.append(record)
+        if added:
+            _save_hotels(hotels)
+        return added
+
     @staticmethod
     def delete_hotel(hotel_id):
         """Delete a hotel by ID."""
         hotels = _load_hotels()
-        if hotel_id not in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' not found.")
+        if hotels.pop(hotel_id, None) is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
             return False
-        del hotels[hotel_id]
         _save_hotels(hotels)
-        print(f"Hotel '{hotel_id}' deleted successfully.")
+        logger.info("Hotel '%s' deleted successfully.", hotel_id)
         return True
 
     @staticmethod
     def display_hotel(hotel_id):
         """Display hotel information."""
-        hotels = _load_hotels()
-        if hotel_id not in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' not found.")
+        data = _find_hotel(hotel_id)
+        if data is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
             return None
-        data = hotels[hotel_id]
         print("--- Hotel Info ---")
         print(f"ID       : {data['hotel_id']}")
         print(f"Name     : {data['name']}")
@@ -112,38 +173,73 @@ class Hotel:
         print(f"Rooms    : {avail}/{total} available")
         return Hotel.from_dict(data)
 
+    @staticmethod
+    def get_available_rooms(hotel_id):
+        """Return a hotel's available room count, or None if not found."""
+        data = _find_hotel(hotel_id)
+        if data is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
+            return None
+        return data["available_rooms"]
+
     @staticmethod
     def modify_hotel(hotel_id, name=None, location=None, total_rooms=None):
         """Modify hotel attributes."""
         hotels = _load_hotels()
-        if hotel_id not in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' not found.")
+        record = hotels.get(hotel_id)
+        if record is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
             return False
         if name:
-            hotels[hotel_id]["name"] = name
+            record["name"] = name
         if location:
-            hotels[hotel_id]["location"] = location
+            record["location"] = location
         if total_rooms is not None:
-            diff = total_rooms - hotels[hotel_id]["total_rooms"]
-            hotels[hotel_id]["total_rooms"] = total_rooms
-            hotels[hotel_id]["available_rooms"] = max(
-                0, hotels[hotel_id]["available_rooms"] + diff
+            diff = total_rooms - record["total_rooms"]
+            record["total_rooms"] = total_rooms
+            record["available_rooms"] = max(
+                0, record["available_rooms"] + diff
             )
         _save_hotels(hotels)
-        print(f"Hotel '{hotel_id}' modified successfully.")
+        logger.info("Hotel '%s' modified successfully.", hotel_id)
+        return True
+
+    @staticmethod
+    def reserve_in(hotels, hotel_id):
+        """Reserve a room in an already-loaded hotels dictionary."""
+        record = hotels.get(hotel_id)
+        if record is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
+            return False
+        if record["available_rooms"] <= 0:
+            logger.error("No available rooms in hotel '%s'.", hotel_id)
+            return False
+        record["available_rooms"] -= 1
+        return True
+
+    @staticmethod
+    def cancel_in(hotels, hotel_id):
+        """Free a room in an already-loaded hotels dictionary."""
+        record = hotels.get(hotel_id)
+        if record is None:
+            logger.error("Hotel with ID '%s' not found.", hotel_id)
+            return False
+        avail = record["available_rooms"]
+        total = record["total_rooms"]
+        if avail >= total:
+            logger.error(
+                "All rooms already available in hotel '%s'.", hotel_id
+            )
+            return False
+        record["available_rooms"] += 1
         return True
 
     @staticmethod
     def reserve_room(hotel_id):
         """Reserve a room in the hotel (decrease available rooms)."""
         hotels = _load_hotels()
-        if hotel_id not in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' not found.")
-            return False
-        if hotels[hotel_id]["available_rooms"] <= 0:
-            print(f"Error: No available rooms in hotel '{hotel_id}'.")
+        if not Hotel.reserve_in(hotels, hotel_id):
             return False
-        hotels[hotel_id]["available_rooms"] -= 1
         _save_hotels(hotels)
         return True
 
@@ -151,16 +247,7 @@ class Hotel:
     def cancel_room(hotel_id):
         """Cancel a room reservation (increase available rooms)."""
         hotels = _load_hotels()
-        if hotel_id not in hotels:
-            print(f"Error: Hotel with ID '{hotel_id}' not found.")
-            return False
-        avail = hotels[hotel_id]["available_rooms"]
-        total = hotels[hotel_id]["total_rooms"]
-        if avail >= total:
-            print(
-                f"Error: All rooms already available in hotel '{hotel_id}'."
-            )
+        if not Hotel.cancel_in(hotels, hotel_id):
             return False
-        hotels[hotel_id]["available_rooms"] += 1
         _save_hotels(hotels)
         return True
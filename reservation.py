@@ -1,74 +1,97 @@
 """Module for Reservation class with file persistence."""
 
-import json
-import os
-import uuid
-from hotel import Hotel
+import atexit
+import logging
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+from customer import _load_customers
+from hotel import Hotel, _load_hotels, _save_hotels
+from storage import JsonStore
+
+logger = logging.getLogger(__name__)
 
 RESERVATIONS_FILE = "data/reservations.json"
 
+AUTOFLUSH = True
+
+_BY_CUSTOMER = {}
+_BY_HOTEL = {}
+
+
+def _rebuild_indexes(reservations):
+    """Rebuild the by-customer and by-hotel inverted indexes."""
+    _BY_CUSTOMER.clear()
+    _BY_HOTEL.clear()
+    for reservation_id, data in reservations.items():
+        _BY_CUSTOMER.setdefault(data["customer_id"], set()).add(
+            reservation_id
+        )
+        _BY_HOTEL.setdefault(data["hotel_id"], set()).add(reservation_id)
+
+
+_STORE = JsonStore("reservations", lambda: RESERVATIONS_FILE,
+                   on_load=_rebuild_indexes)
+
+
+def invalidate_cache():
+    """Clear the in-memory cache and dirty state (used by tests)."""
+    _STORE.invalidate()
+    _BY_CUSTOMER.clear()
+    _BY_HOTEL.clear()
+
 
 def _load_reservations():
-    """Load reservations from JSON file."""
-    if not os.path.exists(RESERVATIONS_FILE):
-        return {}
-    try:
-        with open(RESERVATIONS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                print(
-                    "Error: reservations file "
-                    "has invalid format. Starting fresh."
-                )
-                return {}
-            return data
-    except json.JSONDecodeError as e:
-        print(f"Error reading reservations file: {e}. Starting fresh.")
-        return {}
-    except OSError as e:
-        print(f"Error opening reservations file: {e}. Starting fresh.")
-        return {}
+    """Load reservations from JSON file, reusing the cache when unchanged."""
+    return _STORE.load()
+
+
+# Worker threads only start on first submit, so building the pool at
+# import time costs nothing until _load_all is actually used.
+_POOL = ThreadPoolExecutor(max_workers=3)
+
+
+def _load_all():
+    """Load customers, hotels and reservations concurrently.
+
+    The three files are independent, so their reads and parses are
+    dispatched together and only the slowest one is waited on. The
+    shared pool is reused so repeated calls skip thread start-up
+    costs.
+    """
+    fc = _POOL.submit(_load_customers)
+    fh = _POOL.submit(_load_hotels)
+    fr = _POOL.submit(_load_reservations)
+    return fc.result(), fh.result(), fr.result()
+
+
+def _find_reservation(reservation_id):
+    """Fetch one reservation record from the loaded dictionary."""
+    return _STORE.load().get(reservation_id)
 
 
 def _save_reservations(reservations):
-    """Save reservations dictionary to JSON file."""
-    os.makedirs("data", exist_ok=True)
-    try:
-        with open(RESERVATIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump(reservations, f, indent=4)
-    except OSError as e:
-        print(f"Error saving reservations file: {e}")
-
-
-def _load_customers():
-    """Load customers from JSON file for validation."""
-    customers_file = "data/customers.json"
-    if not os.path.exists(customers_file):
-        return {}
-    try:
-        with open(customers_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
-        print(f"Error reading customers file: {e}.")
-        return {}
-
-
-def _load_hotels():
-    """Load hotels from JSON file for validation."""
-    hotels_file = "data/hotels.json"
-    if not os.path.exists(hotels_file):
-        return {}
-    try:
-        with open(hotels_file, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
-        print(f"Error reading hotels file: {e}.")
-        return {}
+    """Save reservations to JSON file, deferring while AUTOFLUSH is off."""
+    _rebuild_indexes(reservations)
+    _STORE.save(reservations, AUTOFLUSH)
+
+
+def flush():
+    """Write any deferred reservation changes to disk."""
+    _STORE.flush()
+
+
+atexit.register(flush)
 
 
 class Reservation:
     """Represents a reservation linking a customer and a hotel."""
 
+    __slots__ = ("reservation_id", "customer_id", "hotel_id",
+                 "check_in", "check_out")
+
+    _pool = []
+
     def __init__(self, reservation_id, customer_id, hotel_id,
                  check_in, check_out):
         """Initialize a Reservation instance."""
@@ -78,6 +101,25 @@ class Reservation:
         self.check_in = check_in
         self.check_out = check_out
 
+    @classmethod
+    def _acquire(cls, reservation_id, customer_id, hotel_id,
+                 check_in, check_out):
+        """Reuse a pooled instance when available, else build a new one."""
+        if cls._pool:
+            reservation = cls._pool.pop()
+            reservation.reservation_id = reservation_id
+            reservation.customer_id = customer_id
+            reservation.hotel_id = hotel_id
+            reservation.check_in = check_in
+            reservation.check_out = check_out
+            return reservation
+        return cls(reservation_id, customer_id, hotel_id,
+                   check_in, check_out)
+
+    def release(self):
+        """Return this instance to the reuse pool."""
+        type(self)._pool.append(self)
+
     def to_dict(self):
         """Convert reservation to dictionary."""
         return {
@@ -91,7 +133,7 @@ class Reservation:
     @classmethod
     def from_dict(cls, data):
         """Create a Reservation from a dictionary."""
-        return cls(
+        return cls._acquire(
             data["reservation_id"],
             data["customer_id"],
             data["hotel_id"],
@@ -100,58 +142,126 @@ class Reservation:
         )
 
     @staticmethod
-    def create_reservation(customer_id, hotel_id, check_in, check_out):
-        """Create and persist a new reservation."""
-        customers = _load_customers()
+    def flush():
+        """Write any deferred reservation changes to disk."""
+        flush()
+
+    @staticmethod
+    def create_reservation(customer_id, hotel_id, check_in, check_out, *,
+                           customers=None, hotels=None, reservations=None):
+        """Create and persist a new reservation.
+
+        Callers that already hold the loaded customers, hotels or
+        reservations dicts may pass them in to skip the reload; any
+        omitted one is loaded here.
+        """
+        if customers is None or hotels is None or reservations is None:
+            loaded = _load_all()
+            if customers is None:
+                customers = loaded[0]
+            if hotels is None:
+                hotels = loaded[1]
+            if reservations is None:
+                reservations = loaded[2]
         if customer_id not in customers:
-            print(f"Error: Customer '{customer_id}' not found.")
+            logger.error("Customer '%s' not found.", customer_id)
             return None
 
-        hotels = _load_hotels()
         if hotel_id not in hotels:
-            print(f"Error: Hotel '{hotel_id}' not found.")
+            logger.error("Hotel '%s' not found.", hotel_id)
             return None
 
-        if not Hotel.reserve_room(hotel_id):
+        if not Hotel.reserve_in(hotels, hotel_id):
             return None
+        _save_hotels(hotels)
 
-        reservation_id = str(uuid.uuid4())[:8]
+        reservation_id = secrets.token_hex(4)
         reservation = Reservation(
             reservation_id, customer_id, hotel_id, check_in, check_out
         )
-        reservations = _load_reservations()
         reservations[reservation_id] = reservation.to_dict()
         _save_reservations(reservations)
-        print(
-            f"Reservation '{reservation_id}' created: "
-            f"Customer '{customer_id}' at Hotel '{hotel_id}'."
+        logger.info(
+            "Reservation '%s' created: Customer '%s' at Hotel '%s'.",
+            reservation_id, customer_id, hotel_id
         )
         return reservation
 
+    @staticmethod
+    def create_many(records):
+        """Create several reservations with a single load and save.
+
+        Each record needs customer_id, hotel_id, check_in and
+        check_out. Invalid records are skipped. Returns the list of
+        Reservation objects actually created.
+        """
+        customers, hotels, reservations = _load_all()
+        created = []
+        for record in records:
+            customer_id = record.get("customer_id")
+            hotel_id = record.get("hotel_id")
+            check_in = record.get("check_in")
+            check_out = record.get("check_out")
+            if None in (customer_id, hotel_id, check_in, check_out):
+                logger.error(
+                    "Reservation record is missing required fields."
+                )
+                continue
+            if customer_id not in customers:
+                logger.error("Customer '%s' not found.", customer_id)
+                continue
+            if not Hotel.reserve_in(hotels, hotel_id):
+                continue
+            reservation = Reservation(
+                secrets.token_hex(4), customer_id, hotel_id,
+                check_in, check_out,
+            )
+            reservations[reservation.reservation_id] = reservation.to_dict()
+            created.append(reservation)
+        if created:
+            _save_hotels(hotels)
+            _save_reservations(reservations)
+        return created
+
     @staticmethod
     def cancel_reservation(reservation_id):
         """Cancel an existing reservation."""
         reservations = _load_reservations()
-        if reservation_id not in reservations:
-            print(f"Error: Reservation '{reservation_id}' not found.")
+        record = reservations.pop(reservation_id, None)
+        if record is None:
+            logger.error(
+                "Reservation '%s' not found.", reservation_id
+            )
             return False
 
-        hotel_id = reservations[reservation_id]["hotel_id"]
-        Hotel.cancel_room(hotel_id)
-
-        del reservations[reservation_id]
+        Hotel.cancel_room(record["hotel_id"])
         _save_reservations(reservations)
-        print(f"Reservation '{reservation_id}' cancelled successfully.")
+        logger.info(
+            "Reservation '%s' cancelled successfully.", reservation_id
+        )
         return True
 
+    @staticmethod
+    def for_customer(customer_id):
+        """Return the reservation IDs belonging to a customer."""
+        _load_reservations()
+        return sorted(_BY_CUSTOMER.get(customer_id, ()))
+
+    @staticmethod
+    def for_hotel(hotel_id):
+        """Return the reservation IDs booked at a hotel."""
+        _load_reservations()
+        return sorted(_BY_HOTEL.get(hotel_id, ()))
+
     @staticmethod
     def display_reservation(reservation_id):
         """Display reservation information."""
-        reservations = _load_reservations()
-        if reservation_id not in reservations:
-            print(f"Error: Reservation '{reservation_id}' not found.")
+        data = _find_reservation(reservation_id)
+        if data is None:
+            logger.error(
+                "Reservation '%s' not found.", reservation_id
+            )
             return None
-        data = reservations[reservation_id]
         print("--- Reservation Info ---")
         print(f"Reservation ID : {data['reservation_id']}")
         print(f"Customer ID    : {data['customer_id']}")
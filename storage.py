@@ -0,0 +1,171 @@
+"""Shared JSON persistence helpers for the data modules."""
+
+import json
+import logging
+import mmap
+import os
+import tempfile
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_MMAP_THRESHOLD = 256 * 1024
+
+
+def _loads(payload):
+    """Parse JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _dumps(data):
+    """Serialize data to compact JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _parse_file(path, size):
+    """Parse a JSON file, memory-mapping large files to skip a copy.
+
+    An empty file counts as an empty dictionary rather than a parse
+    error, so a truncated-at-creation file does not log a warning.
+    """
+    if size == 0:
+        return {}
+    with open(path, "rb") as f:
+        if orjson is not None and size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return orjson.loads(memoryview(mm))
+        return _loads(f.read())
+
+
+class JsonStore:
+    """Cached atomic persistence for one dictionary-shaped JSON file.
+
+    The file path is re-read from ``path_getter`` on every call so the
+    tests can repoint a module's file constant with mock.patch. State
+    is keyed by path, which keeps a repointed store from serving data
+    cached for the old location. ``on_load`` runs whenever a fresh
+    dictionary is produced, letting callers rebuild derived indexes.
+    """
+
+    def __init__(self, label, path_getter, on_load=None):
+        """Initialize a store for the file named by path_getter."""
+        self._label = label
+        self._path_getter = path_getter
+        self._on_load = on_load
+        self._cache = {}
+        self._dirty = set()
+        self._ready_dirs = set()
+        self._last_hash = {}
+
+    def invalidate(self):
+        """Clear the in-memory cache and dirty state (used by tests)."""
+        self._cache.clear()
+        self._dirty.clear()
+        self._ready_dirs.clear()
+        self._last_hash.clear()
+
+    def _ensure_dir(self, path):
+        """Create the data directory once per distinct location."""
+        directory = os.path.dirname(path) or "."
+        if directory not in self._ready_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._ready_dirs.add(directory)
+
+    def _loaded(self, data):
+        """Run the on_load hook against a freshly produced dictionary."""
+        if self._on_load is not None:
+            self._on_load(data)
+        return data
+
+    def load(self):
+        """Load the file's dictionary, reusing the cache when unchanged."""
+        path = self._path_getter()
+        if path in self._dirty:
+            return self._cache[path][1]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return self._loaded({})
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            data = _parse_file(path, stat.st_size)
+            if not isinstance(data, dict):
+                logger.error(
+                    "%s file has invalid format. Starting fresh.",
+                    self._label.capitalize(),
+                )
+                return self._loaded({})
+        except (ValueError, OSError) as e:
+            logger.error(
+                "Error reading %s file: %s. Starting fresh.",
+                self._label, e,
+            )
+            return self._loaded({})
+        self._cache[path] = (key, data)
+        return self._loaded(data)
+
+    def write(self, data):
+        """Write the dictionary to disk atomically and refresh the cache."""
+        path = self._path_getter()
+        payload = _dumps(data)
+        digest = hash(payload)
+        if self._last_hash.get(path) == digest and os.path.exists(path):
+            self._dirty.discard(path)
+            return
+        self._ensure_dir(path)
+        directory = os.path.dirname(path) or "."
+        tmp_path = None
+        try:
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory)
+            except FileNotFoundError:
+                # The directory was removed after init: recreate and retry.
+                self._ready_dirs.discard(directory)
+                self._ensure_dir(path)
+                fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            stat = os.stat(path)
+        except OSError as e:
+            logger.error("Error saving %s file: %s", self._label, e)
+            # A mutated dict that never hit disk must not stay cached;
+            # deferred data stays because the cache is its only copy.
+            if path not in self._dirty:
+                self._cache.pop(path, None)
+            self._last_hash.pop(path, None)
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+        self._cache[path] = ((stat.st_mtime_ns, stat.st_size), data)
+        self._dirty.discard(path)
+        self._last_hash[path] = digest
+
+    def save(self, data, autoflush=True):
+        """Persist the dictionary, deferring the write when asked to."""
+        if autoflush:
+            self.write(data)
+            return
+        path = self._path_getter()
+        self._cache[path] = (None, data)
+        self._dirty.add(path)
+
+    def flush(self):
+        """Write any deferred changes to disk."""
+        path = self._path_getter()
+        if path in self._dirty:
+            self.write(self._cache[path][1])
@@ -2,31 +2,35 @@
 
 import json
 import os
+import tempfile
 import unittest
-import shutil
-from customer import Customer, _load_customers, _save_customers, CUSTOMERS_FILE
+from unittest import mock
+import customer
+from customer import Customer, _load_customers, _save_customers
 
 
 class TestCustomer(unittest.TestCase):
     """Test cases for Customer class."""
 
     def setUp(self):
-        """Set up test environment with a fresh data directory."""
-        os.makedirs("data", exist_ok=True)
-        if os.path.exists(CUSTOMERS_FILE):
-            os.remove(CUSTOMERS_FILE)
-
-    def tearDown(self):
-        """Clean up test data files."""
-        if os.path.exists(CUSTOMERS_FILE):
-            os.remove(CUSTOMERS_FILE)
+        """Point the customers file at a fresh temporary directory."""
+        # pylint: disable-next=consider-using-with
+        tmp = self.enterContext(tempfile.TemporaryDirectory())
+        patcher = mock.patch.object(
+            customer, "CUSTOMERS_FILE",
+            os.path.join(tmp, "data", "customers.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        customer.invalidate_cache()
+        self.addCleanup(customer.invalidate_cache)
 
     # --- to_dict / from_dict ---
 
     def test_to_dict(self):
         """Test Customer to_dict returns correct structure."""
-        customer = Customer("C1", "Alice", "alice@mail.com", "1234567890")
-        d = customer.to_dict()
+        cust = Customer("C1", "Alice", "alice@mail.com", "1234567890")
+        d = cust.to_dict()
         self.assertEqual(d["customer_id"], "C1")
         self.assertEqual(d["name"], "Alice")
         self.assertEqual(d["email"], "alice@mail.com")
@@ -39,19 +43,35 @@ class TestCustomer(unittest.TestCase):
             "email": "bob@mail.com",
             "phone": "0987654321",
         }
-        customer = Customer.from_dict(data)
-        self.assertEqual(customer.customer_id, "C2")
-        self.assertEqual(customer.name, "Bob")
+        cust = Customer.from_dict(data)
+        self.assertEqual(cust.customer_id, "C2")
+        self.assertEqual(cust.name, "Bob")
+
+    def test_release_recycles_instance(self):
+        """Test from_dict reuses a released instance and overwrites it."""
+        cust = Customer("C1", "Alice", "alice@mail.com", "123")
+        cust.release()
+        recycled = Customer.from_dict({
+            "customer_id": "C2",
+            "name": "Bob",
+            "email": "bob@mail.com",
+            "phone": "456",
+        })
+        self.assertIs(recycled, cust)
+        self.assertEqual(recycled.customer_id, "C2")
+        self.assertEqual(recycled.name, "Bob")
+        self.assertEqual(recycled.email, "bob@mail.com")
+        self.assertEqual(recycled.phone, "456")
 
     # --- create_customer ---
 
     def test_create_customer_success(self):
         """Test successful customer creation."""
-        customer = Customer.create_customer(
+        cust = Customer.create_customer(
             "C1", "Alice", "alice@mail.com", "123"
         )
-        self.assertIsNotNone(customer)
-        self.assertEqual(customer.name, "Alice")
+        self.assertIsNotNone(cust)
+        self.assertEqual(cust.name, "Alice")
 
     def test_create_customer_duplicate(self):
         """Test creating a customer with duplicate ID returns None."""
@@ -59,6 +79,24 @@ class TestCustomer(unittest.TestCase):
         result = Customer.create_customer("C1", "Bob", "bob@mail.com", "456")
         self.assertIsNone(result)
 
+    # --- create_many ---
+
+    def test_create_many_skips_duplicates(self):
+        """Test create_many adds new records and skips existing IDs."""
+        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
+        added = Customer.create_many([
+            {"customer_id": "C1", "name": "Dup",
+             "email": "d@mail.com", "phone": "0"},
+            {"customer_id": "C2", "name": "Bob",
+             "email": "bob@mail.com", "phone": "456"},
+            {"customer_id": "C3", "name": "NoMail"},
+        ])
+        self.assertEqual(len(added), 1)
+        customers = _load_customers()
+        self.assertEqual(customers["C1"]["name"], "Alice")
+        self.assertEqual(customers["C2"]["name"], "Bob")
+        self.assertNotIn("C3", customers)
+
     # --- delete_customer ---
 
     def test_delete_customer_success(self):
@@ -79,9 +117,9 @@ class TestCustomer(unittest.TestCase):
     def test_display_customer_success(self):
         """Test display returns correct Customer object."""
         Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
-        customer = Customer.display_customer("C1")
-        self.assertIsNotNone(customer)
-        self.assertEqual(customer.name, "Alice")
+        cust = Customer.display_customer("C1")
+        self.assertIsNotNone(cust)
+        self.assertEqual(cust.name, "Alice")
 
     def test_display_customer_not_found(self):
         """Test displaying a non-existent customer returns None."""
@@ -117,34 +155,63 @@ class TestCustomer(unittest.TestCase):
         result = Customer.modify_customer("NONEXISTENT", name="Ghost")
         self.assertFalse(result)
 
+    # --- failed saves ---
+
+    def test_failed_save_evicts_stale_cache(self):
+        """Test a failed write does not keep serving unsaved data."""
+        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
+        with mock.patch("storage.os.replace", side_effect=OSError):
+            Customer.modify_customer("C1", name="Mallory")
+        customers = _load_customers()
+        self.assertEqual(customers["C1"]["name"], "Alice")
+
+    # --- deferred saves ---
+
+    def test_deferred_save_flushes_on_demand(self):
+        """Test saves defer while AUTOFLUSH is off until flush runs."""
+        patcher = mock.patch.object(customer, "AUTOFLUSH", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
+        self.assertFalse(os.path.exists(customer.CUSTOMERS_FILE))
+        Customer.flush()
+        self.assertTrue(os.path.exists(customer.CUSTOMERS_FILE))
+        self.assertIn("C1", _load_customers())
+
     # --- invalid file handling ---
 
     def test_load_customers_invalid_json(self):
         """Test loading corrupted JSON file returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(CUSTOMERS_FILE, "w", encoding="utf-8") as f:
+        os.makedirs(os.path.dirname(customer.CUSTOMERS_FILE), exist_ok=True)
+        with open(customer.CUSTOMERS_FILE, "w", encoding="utf-8") as f:
             f.write("INVALID JSON }{")
         customers = _load_customers()
         self.assertEqual(customers, {})
 
     def test_load_customers_invalid_format(self):
         """Test loading a JSON file with wrong format returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(CUSTOMERS_FILE, "w", encoding="utf-8") as f:
+        os.makedirs(os.path.dirname(customer.CUSTOMERS_FILE), exist_ok=True)
+        with open(customer.CUSTOMERS_FILE, "w", encoding="utf-8") as f:
             json.dump(["not", "a", "dict"], f)
         customers = _load_customers()
         self.assertEqual(customers, {})
 
+    def test_load_customers_empty_file(self):
+        """Test loading an empty file returns empty dict."""
+        os.makedirs(os.path.dirname(customer.CUSTOMERS_FILE), exist_ok=True)
+        with open(customer.CUSTOMERS_FILE, "wb") as f:
+            f.write(b"")
+        customers = _load_customers()
+        self.assertEqual(customers, {})
+
     def test_save_customers_creates_directory(self):
         """Test save creates data directory if missing."""
-        if os.path.exists("data"):
-            shutil.rmtree("data")
         customers = {
             "C1": {"customer_id": "C1", "name": "Test",
                    "email": "t@t.com", "phone": "0"}
         }
         _save_customers(customers)
-        self.assertTrue(os.path.exists(CUSTOMERS_FILE))
+        self.assertTrue(os.path.exists(customer.CUSTOMERS_FILE))
 
 
 if __name__ == "__main__":
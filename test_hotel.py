@@ -2,31 +2,35 @@
 
 import json
 import os
+import tempfile
 import unittest
-import shutil
-from hotel import Hotel, _load_hotels, _save_hotels, HOTELS_FILE
+from unittest import mock
+import hotel
+from hotel import Hotel, _load_hotels, _save_hotels
 
 
 class TestHotel(unittest.TestCase):
     """Test cases for Hotel class."""
 
     def setUp(self):
-        """Set up test environment with a fresh data directory."""
-        os.makedirs("data", exist_ok=True)
-        if os.path.exists(HOTELS_FILE):
-            os.remove(HOTELS_FILE)
-
-    def tearDown(self):
-        """Clean up test data files."""
-        if os.path.exists(HOTELS_FILE):
-            os.remove(HOTELS_FILE)
+        """Point the hotels file at a fresh temporary directory."""
+        # pylint: disable-next=consider-using-with
+        tmp = self.enterContext(tempfile.TemporaryDirectory())
+        patcher = mock.patch.object(
+            hotel, "HOTELS_FILE",
+            os.path.join(tmp, "data", "hotels.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        hotel.invalidate_cache()
+        self.addCleanup(hotel.invalidate_cache)
 
     # --- to_dict / from_dict ---
 
     def test_to_dict(self):
         """Test Hotel to_dict returns correct structure."""
-        hotel = Hotel("H1", "Grand", "NYC", 10)
-        d = hotel.to_dict()
+        htl = Hotel("H1", "Grand", "NYC", 10)
+        d = htl.to_dict()
         self.assertEqual(d["hotel_id"], "H1")
         self.assertEqual(d["name"], "Grand")
         self.assertEqual(d["total_rooms"], 10)
@@ -40,9 +44,9 @@ class TestHotel(unittest.TestCase):
             "total_rooms": 5,
             "available_rooms": 3,
         }
-        hotel = Hotel.from_dict(data)
-        self.assertEqual(hotel.hotel_id, "H2")
-        self.assertEqual(hotel.available_rooms, 3)
+        htl = Hotel.from_dict(data)
+        self.assertEqual(htl.hotel_id, "H2")
+        self.assertEqual(htl.available_rooms, 3)
 
     def test_from_dict_missing_available_rooms(self):
         """Test from_dict defaults available_rooms to total_rooms."""
@@ -52,16 +56,32 @@ class TestHotel(unittest.TestCase):
             "location": "TX",
             "total_rooms": 8,
         }
-        hotel = Hotel.from_dict(data)
-        self.assertEqual(hotel.available_rooms, 8)
+        htl = Hotel.from_dict(data)
+        self.assertEqual(htl.available_rooms, 8)
+
+    def test_release_recycles_instance(self):
+        """Test from_dict reuses a released instance and overwrites it."""
+        htl = Hotel("H1", "Grand", "NYC", 10)
+        htl.release()
+        recycled = Hotel.from_dict({
+            "hotel_id": "H2",
+            "name": "Plaza",
+            "location": "LA",
+            "total_rooms": 5,
+            "available_rooms": 3,
+        })
+        self.assertIs(recycled, htl)
+        self.assertEqual(recycled.hotel_id, "H2")
+        self.assertEqual(recycled.total_rooms, 5)
+        self.assertEqual(recycled.available_rooms, 3)
 
     # --- create_hotel ---
 
     def test_create_hotel_success(self):
         """Test successful hotel creation."""
-        hotel = Hotel.create_hotel("H1", "Grand", "NYC", 10)
-        self.assertIsNotNone(hotel)
-        self.assertEqual(hotel.name, "Grand")
+        htl = Hotel.create_hotel("H1", "Grand", "NYC", 10)
+        self.assertIsNotNone(htl)
+        self.assertEqual(htl.name, "Grand")
 
     def test_create_hotel_duplicate(self):
         """Test creating a hotel with duplicate ID returns None."""
@@ -69,6 +89,24 @@ class TestHotel(unittest.TestCase):
         result = Hotel.create_hotel("H1", "Another", "LA", 5)
         self.assertIsNone(result)
 
+    # --- create_many ---
+
+    def test_create_many_skips_duplicates(self):
+        """Test create_many adds new records and skips existing IDs."""
+        Hotel.create_hotel("H1", "Grand", "NYC", 10)
+        added = Hotel.create_many([
+            {"hotel_id": "H1", "name": "Dup", "location": "LA",
+             "total_rooms": 3},
+            {"hotel_id": "H2", "name": "Plaza", "location": "LA",
+             "total_rooms": 5},
+            {"hotel_id": "H3", "name": "NoRooms", "location": "TX"},
+        ])
+        self.assertEqual(len(added), 1)
+        hotels = _load_hotels()
+        self.assertEqual(hotels["H1"]["name"], "Grand")
+        self.assertEqual(hotels["H2"]["available_rooms"], 5)
+        self.assertNotIn("H3", hotels)
+
     # --- delete_hotel ---
 
     def test_delete_hotel_success(self):
@@ -89,9 +127,9 @@ class TestHotel(unittest.TestCase):
     def test_display_hotel_success(self):
         """Test display returns correct Hotel object."""
         Hotel.create_hotel("H1", "Grand", "NYC", 10)
-        hotel = Hotel.display_hotel("H1")
-        self.assertIsNotNone(hotel)
-        self.assertEqual(hotel.name, "Grand")
+        htl = Hotel.display_hotel("H1")
+        self.assertIsNotNone(htl)
+        self.assertEqual(htl.name, "Grand")
 
     def test_display_hotel_not_found(self):
         """Test displaying a non-existent hotel returns None."""
@@ -143,6 +181,18 @@ class TestHotel(unittest.TestCase):
         result = Hotel.reserve_room("NONEXISTENT")
         self.assertFalse(result)
 
+    # --- get_available_rooms ---
+
+    def test_get_available_rooms(self):
+        """Test get_available_rooms reflects reservations."""
+        Hotel.create_hotel("H1", "Grand", "NYC", 5)
+        Hotel.reserve_room("H1")
+        self.assertEqual(Hotel.get_available_rooms("H1"), 4)
+
+    def test_get_available_rooms_not_found(self):
+        """Test get_available_rooms returns None for unknown hotels."""
+        self.assertIsNone(Hotel.get_available_rooms("NONEXISTENT"))
+
     # --- cancel_room ---
 
     def test_cancel_room_success(self):
@@ -165,34 +215,53 @@ class TestHotel(unittest.TestCase):
         result = Hotel.cancel_room("NONEXISTENT")
         self.assertFalse(result)
 
+    # --- deferred saves ---
+
+    def test_deferred_save_flushes_on_demand(self):
+        """Test saves defer while AUTOFLUSH is off until flush runs."""
+        patcher = mock.patch.object(hotel, "AUTOFLUSH", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        Hotel.create_hotel("H1", "Grand", "NYC", 10)
+        self.assertFalse(os.path.exists(hotel.HOTELS_FILE))
+        Hotel.flush()
+        self.assertTrue(os.path.exists(hotel.HOTELS_FILE))
+        self.assertIn("H1", _load_hotels())
+
     # --- invalid file handling ---
 
     def test_load_hotels_invalid_json(self):
         """Test loading corrupted JSON file returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(HOTELS_FILE, "w", encoding="utf-8") as f:
+        os.makedirs(os.path.dirname(hotel.HOTELS_FILE), exist_ok=True)
+        with open(hotel.HOTELS_FILE, "w", encoding="utf-8") as f:
             f.write("NOT VALID JSON {{")
         hotels = _load_hotels()
         self.assertEqual(hotels, {})
 
     def test_load_hotels_invalid_format(self):
         """Test loading a JSON file with wrong format returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(HOTELS_FILE, "w", encoding="utf-8") as f:
+        os.makedirs(os.path.dirname(hotel.HOTELS_FILE), exist_ok=True)
+        with open(hotel.HOTELS_FILE, "w", encoding="utf-8") as f:
             json.dump(["list", "not", "dict"], f)
         hotels = _load_hotels()
         self.assertEqual(hotels, {})
 
+    def test_load_hotels_empty_file(self):
+        """Test loading an empty file returns empty dict."""
+        os.makedirs(os.path.dirname(hotel.HOTELS_FILE), exist_ok=True)
+        with open(hotel.HOTELS_FILE, "wb") as f:
+            f.write(b"")
+        hotels = _load_hotels()
+        self.assertEqual(hotels, {})
+
     def test_save_hotels_creates_directory(self):
         """Test save creates data directory if missing."""
-        if os.path.exists("data"):
-            shutil.rmtree("data")
         hotels = {
             "H1": {"hotel_id": "H1", "name": "Test", "location": "X",
                    "total_rooms": 1, "available_rooms": 1}
         }
         _save_hotels(hotels)
-        self.assertTrue(os.path.exists(HOTELS_FILE))
+        self.assertTrue(os.path.exists(hotel.HOTELS_FILE))
 
 
 if __name__ == "__main__":
@@ -4,33 +4,34 @@ import json
 import os
 import unittest
 import shutil
-from hotel import Hotel, HOTELS_FILE
-from customer import Customer, CUSTOMERS_FILE
+import tempfile
+from unittest import mock
+from types import MappingProxyType
+import customer
+import hotel
+import reservation
+from hotel import Hotel, _load_hotels
+from customer import Customer, _load_customers
 from reservation import (
     Reservation,
     _load_reservations,
     _save_reservations,
-    RESERVATIONS_FILE,
 )
 
 
-class TestReservation(unittest.TestCase):
-    """Test cases for Reservation class."""
+_RES_ARGS = ("C1", "H1", "2025-01-01", "2025-01-05")
 
-    def setUp(self):
-        """Set up test environment with sample hotel and customer."""
-        os.makedirs("data", exist_ok=True)
-        for f in [HOTELS_FILE, CUSTOMERS_FILE, RESERVATIONS_FILE]:
-            if os.path.exists(f):
-                os.remove(f)
-        Hotel.create_hotel("H1", "Grand", "NYC", 5)
-        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
+_FROM_DICT_PAYLOAD = MappingProxyType({
+    "reservation_id": "R2",
+    "customer_id": "C1",
+    "hotel_id": "H1",
+    "check_in": "2025-02-01",
+    "check_out": "2025-02-05",
+})
 
-    def tearDown(self):
-        """Clean up test data files."""
-        for f in [HOTELS_FILE, CUSTOMERS_FILE, RESERVATIONS_FILE]:
-            if os.path.exists(f):
-                os.remove(f)
+
+class TestReservationPure(unittest.TestCase):
+    """Test cases that build Reservation objects without touching disk."""
 
     # --- to_dict / from_dict ---
 
@@ -44,48 +45,120 @@ class TestReservation(unittest.TestCase):
 
     def test_from_dict(self):
         """Test Reservation from_dict creates correct instance."""
-        data = {
-            "reservation_id": "R2",
-            "customer_id": "C1",
-            "hotel_id": "H1",
-            "check_in": "2025-02-01",
-            "check_out": "2025-02-05",
-        }
-        res = Reservation.from_dict(data)
+        res = Reservation.from_dict(dict(_FROM_DICT_PAYLOAD))
         self.assertEqual(res.reservation_id, "R2")
         self.assertEqual(res.check_in, "2025-02-01")
 
-    # --- create_reservation ---
+    def test_release_recycles_instance(self):
+        """Test from_dict reuses a released instance and overwrites it."""
+        res = Reservation("R1", "C9", "H9", "2024-12-01", "2024-12-02")
+        res.release()
+        recycled = Reservation.from_dict(dict(_FROM_DICT_PAYLOAD))
+        self.assertIs(recycled, res)
+        self.assertEqual(recycled.reservation_id, "R2")
+        self.assertEqual(recycled.customer_id, "C1")
+        self.assertEqual(recycled.check_out, "2025-02-05")
 
-    def test_create_reservation_success(self):
-        """Test successful reservation creation."""
-        res = Reservation.create_reservation(
-            "C1", "H1", "2025-01-01", "2025-01-05"
+
+class TestReservation(unittest.TestCase):
+    """Test cases for Reservation class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Point the data files at tmpfs and snapshot pristine fixtures."""
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        cls._tmp = tempfile.mkdtemp(dir=base)
+        cls.addClassCleanup(shutil.rmtree, cls._tmp, ignore_errors=True)
+        cls._data_dir = os.path.join(cls._tmp, "data")
+        for module, name in (
+            (hotel, "HOTELS_FILE"),
+            (customer, "CUSTOMERS_FILE"),
+            (reservation, "RESERVATIONS_FILE"),
+        ):
+            patcher = mock.patch.object(
+                module, name,
+                os.path.join(cls._data_dir,
+                             os.path.basename(getattr(module, name))),
+            )
+            patcher.start()
+            cls.addClassCleanup(patcher.stop)
+            module.invalidate_cache()
+            cls.addClassCleanup(module.invalidate_cache)
+        cls._targets = frozenset(
+            os.path.basename(p)
+            for p in (hotel.HOTELS_FILE, customer.CUSTOMERS_FILE,
+                      reservation.RESERVATIONS_FILE)
         )
-        self.assertIsNotNone(res)
-        self.assertEqual(res.customer_id, "C1")
-        self.assertEqual(res.hotel_id, "H1")
+        os.makedirs(cls._data_dir, exist_ok=True)
+        Hotel.create_hotel("H1", "Grand", "NYC", 5)
+        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
+        with open(hotel.HOTELS_FILE, "rb") as f:
+            cls._hotels_bytes = f.read()
+        with open(customer.CUSTOMERS_FILE, "rb") as f:
+            cls._customers_bytes = f.read()
+
+    @classmethod
+    def _wipe(cls):
+        """Unlink the fixture data files in one directory scan."""
+        try:
+            with os.scandir(cls._data_dir) as entries:
+                for entry in entries:
+                    if entry.name in cls._targets:
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+
+    def setUp(self):
+        """Restore the pristine fixture files from the cached snapshots."""
+        self._wipe()
+        with open(hotel.HOTELS_FILE, "wb") as f:
+            f.write(self._hotels_bytes)
+        with open(customer.CUSTOMERS_FILE, "wb") as f:
+            f.write(self._customers_bytes)
+        hotel.invalidate_cache()
+        customer.invalidate_cache()
+        reservation.invalidate_cache()
+
+    def tearDown(self):
+        """Clean up test data files."""
+        self._wipe()
+
+    # --- create_reservation ---
+
+    def test_create_reservation_matrix(self):
+        """Test create_reservation outcomes across argument tables."""
+        cases = [
+            ("C1", "H1", True),
+            ("INVALID_C", "H1", False),
+            ("C1", "INVALID_H", False),
+        ]
+        for customer_id, hotel_id, expect_created in cases:
+            with self.subTest(customer=customer_id, hotel=hotel_id):
+                res = Reservation.create_reservation(
+                    customer_id, hotel_id, "2025-01-01", "2025-01-05"
+                )
+                self.assertEqual(res is not None, expect_created)
+                if res is not None:
+                    self.assertEqual(res.customer_id, customer_id)
+                    self.assertEqual(res.hotel_id, hotel_id)
 
     def test_create_reservation_decreases_available_rooms(self):
         """Test that creating a reservation decreases hotel available rooms."""
-        Reservation.create_reservation("C1", "H1", "2025-01-01", "2025-01-05")
-        from hotel import _load_hotels
-        hotels = _load_hotels()
-        self.assertEqual(hotels["H1"]["available_rooms"], 4)
-
-    def test_create_reservation_customer_not_found(self):
-        """Test creating reservation with invalid customer returns None."""
-        result = Reservation.create_reservation(
-            "INVALID_C", "H1", "2025-01-01", "2025-01-05"
-        )
-        self.assertIsNone(result)
+        Reservation.create_reservation(*_RES_ARGS)
+        self.assertEqual(Hotel.get_available_rooms("H1"), 4)
 
-    def test_create_reservation_hotel_not_found(self):
-        """Test creating reservation with invalid hotel returns None."""
-        result = Reservation.create_reservation(
-            "C1", "INVALID_H", "2025-01-01", "2025-01-05"
+    def test_create_reservation_with_preloaded_state(self):
+        """Test create_reservation mutates injected pre-loaded dicts."""
+        customers = _load_customers()
+        hotels = _load_hotels()
+        reservations = _load_reservations()
+        res = Reservation.create_reservation(
+            *_RES_ARGS, customers=customers, hotels=hotels,
+            reservations=reservations,
         )
-        self.assertIsNone(result)
+        self.assertIsNotNone(res)
+        self.assertIn(res.reservation_id, reservations)
+        self.assertEqual(hotels["H1"]["available_rooms"], 4)
 
     def test_create_reservation_no_rooms(self):
         """Test creating reservation when hotel has no rooms returns None."""
@@ -98,13 +171,29 @@ class TestReservation(unittest.TestCase):
         )
         self.assertIsNone(result)
 
+    # --- create_many ---
+
+    def test_create_many_skips_invalid_records(self):
+        """Test create_many creates valid records and skips bad ones."""
+        created = Reservation.create_many([
+            {"customer_id": "C1", "hotel_id": "H1",
+             "check_in": "2025-01-01", "check_out": "2025-01-05"},
+            {"customer_id": "GHOST", "hotel_id": "H1",
+             "check_in": "2025-01-01", "check_out": "2025-01-05"},
+            {"customer_id": "C1", "hotel_id": "H1",
+             "check_in": "2025-01-01"},
+        ])
+        self.assertEqual(len(created), 1)
+        self.assertEqual(created[0].customer_id, "C1")
+        reservations = _load_reservations()
+        self.assertIn(created[0].reservation_id, reservations)
+        self.assertEqual(Hotel.get_available_rooms("H1"), 4)
+
     # --- cancel_reservation ---
 
     def test_cancel_reservation_success(self):
         """Test successful reservation cancellation."""
-        res = Reservation.create_reservation(
-            "C1", "H1", "2025-01-01", "2025-01-05"
-        )
+        res = Reservation.create_reservation(*_RES_ARGS)
         result = Reservation.cancel_reservation(res.reservation_id)
         self.assertTrue(result)
         reservations = _load_reservations()
@@ -112,26 +201,40 @@ class TestReservation(unittest.TestCase):
 
     def test_cancel_reservation_restores_room(self):
         """Test that cancelling a reservation restores available rooms."""
-        res = Reservation.create_reservation(
-            "C1", "H1", "2025-01-01", "2025-01-05"
-        )
+        res = Reservation.create_reservation(*_RES_ARGS)
         Reservation.cancel_reservation(res.reservation_id)
-        from hotel import _load_hotels
-        hotels = _load_hotels()
-        self.assertEqual(hotels["H1"]["available_rooms"], 5)
+        self.assertEqual(Hotel.get_available_rooms("H1"), 5)
 
     def test_cancel_reservation_not_found(self):
         """Test cancelling a non-existent reservation returns False."""
         result = Reservation.cancel_reservation("NONEXISTENT")
         self.assertFalse(result)
 
+    # --- for_customer / for_hotel ---
+
+    def test_for_customer_lists_reservations(self):
+        """Test for_customer returns the customer's reservation IDs."""
+        res = Reservation.create_reservation(*_RES_ARGS)
+        self.assertEqual(
+            Reservation.for_customer("C1"), [res.reservation_id]
+        )
+
+    def test_for_customer_unknown_is_empty(self):
+        """Test for_customer returns an empty list for unknown IDs."""
+        self.assertEqual(Reservation.for_customer("NOBODY"), [])
+
+    def test_for_hotel_updates_on_cancel(self):
+        """Test for_hotel drops cancelled reservations."""
+        res = Reservation.create_reservation(*_RES_ARGS)
+        self.assertEqual(Reservation.for_hotel("H1"), [res.reservation_id])
+        Reservation.cancel_reservation(res.reservation_id)
+        self.assertEqual(Reservation.for_hotel("H1"), [])
+
     # --- display_reservation ---
 
     def test_display_reservation_success(self):
         """Test display returns correct Reservation object."""
-        res = Reservation.create_reservation(
-            "C1", "H1", "2025-01-01", "2025-01-05"
-        )
+        res = Reservation.create_reservation(*_RES_ARGS)
         displayed = Reservation.display_reservation(res.reservation_id)
         self.assertIsNotNone(displayed)
         self.assertEqual(displayed.customer_id, "C1")
@@ -141,37 +244,71 @@ class TestReservation(unittest.TestCase):
         result = Reservation.display_reservation("NONEXISTENT")
         self.assertIsNone(result)
 
+    # --- deferred saves ---
+
+    def test_deferred_save_flushes_on_demand(self):
+        """Test saves defer while AUTOFLUSH is off until flush runs."""
+        patcher = mock.patch.object(reservation, "AUTOFLUSH", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        res = Reservation.create_reservation(*_RES_ARGS)
+        self.assertFalse(os.path.exists(reservation.RESERVATIONS_FILE))
+        Reservation.flush()
+        self.assertTrue(os.path.exists(reservation.RESERVATIONS_FILE))
+        self.assertIn(res.reservation_id, _load_reservations())
+
+    # --- load caching ---
+
+    def test_load_reservations_reuses_cache_when_unchanged(self):
+        """Test repeated loads of an untouched file share one dict."""
+        Reservation.create_reservation(*_RES_ARGS)
+        first = _load_reservations()
+        second = _load_reservations()
+        self.assertIs(first, second)
+
+    def test_load_reservations_sees_external_rewrite(self):
+        """Test an out-of-band file rewrite invalidates the cache."""
+        Reservation.create_reservation(*_RES_ARGS)
+        self.assertEqual(len(_load_reservations()), 1)
+        with open(reservation.RESERVATIONS_FILE, "wb") as f:
+            f.write(b"{}")
+        self.assertEqual(_load_reservations(), {})
+
     # --- invalid file handling ---
 
     def test_load_reservations_invalid_json(self):
         """Test loading corrupted JSON file returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(RESERVATIONS_FILE, "w", encoding="utf-8") as f:
+        with open(reservation.RESERVATIONS_FILE, "w", encoding="utf-8") as f:
             f.write("BAD JSON {{{")
         reservations = _load_reservations()
         self.assertEqual(reservations, {})
 
     def test_load_reservations_invalid_format(self):
         """Test loading JSON with wrong format returns empty dict."""
-        os.makedirs("data", exist_ok=True)
-        with open(RESERVATIONS_FILE, "w", encoding="utf-8") as f:
+        with open(reservation.RESERVATIONS_FILE, "w", encoding="utf-8") as f:
             json.dump(["not", "a", "dict"], f)
         reservations = _load_reservations()
         self.assertEqual(reservations, {})
 
+    def test_load_reservations_empty_file(self):
+        """Test loading an empty file returns empty dict."""
+        with open(reservation.RESERVATIONS_FILE, "wb") as f:
+            f.write(b"")
+        reservations = _load_reservations()
+        self.assertEqual(reservations, {})
+
     def test_save_reservations_creates_directory(self):
         """Test save creates data directory if missing."""
-        if os.path.exists("data"):
-            shutil.rmtree("data")
-        os.makedirs("data", exist_ok=True)
-        # Recreate required files after rmtree
-        Hotel.create_hotel("H1", "Grand", "NYC", 5)
-        Customer.create_customer("C1", "Alice", "alice@mail.com", "123")
         data = {"R1": {"reservation_id": "R1", "customer_id": "C1",
                        "hotel_id": "H1", "check_in": "2025-01-01",
                        "check_out": "2025-01-05"}}
-        _save_reservations(data)
-        self.assertTrue(os.path.exists(RESERVATIONS_FILE))
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "sub", "reservations.json")
+            with mock.patch.object(
+                reservation, "RESERVATIONS_FILE", target
+            ):
+                _save_reservations(data)
+                self.assertTrue(os.path.exists(target))
 
 
 if __name__ == "__main__":